@@ -31,6 +31,7 @@ DEFAULTS_APPLICATION = {
     "DEVICE_NAME": "Mein Bilderrahmen",
     "ORIENTATION": "landscape",
     "SATURATION": "0.8",
+    "PREVIEW_REPLY": "true",
     "ATTACHMENT_MAX_BYTES": "20971520",
     "POLL_INTERVAL": "60",
 }
@@ -53,6 +54,10 @@ CONFIG_FILE = "bilderrahmen.config"
 # Keep track of the config file path
 _config_file_path: str | None = None
 
+# (mtime_ns, size, inode) of the config file and the settings parsed from it.
+# Stored as one tuple so concurrent readers never see a mismatched pair.
+_settings_cache: tuple[tuple, dict[str, str]] | None = None
+
 # Template for new config files with descriptions
 template = "\n# Bilderrahmen Configuration File\n"
 template += "\n"
@@ -137,29 +142,58 @@ def read_setting_int(name: str, default: int) -> int:
         return default
 
 
-def read_setting(name: str, default: str | None = None) -> str | None:
-    """Read a single setting from the config file. Returns `default` if not present."""
+def _parse_config_file(path: str) -> dict[str, str]:
+    """Parse all settings from the config file into a dict (first occurrence wins)."""
+    settings: dict[str, str] = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#") or "=" not in line:
+                continue
+            # naive parsing: split at first = and strip quotes
+            key, rhs = line.split("=", 1)
+            rhs = rhs.strip()
+            if rhs.startswith('"') and rhs.endswith('"'):
+                rhs = rhs[1:-1]
+            elif rhs.startswith("'") and rhs.endswith("'"):
+                rhs = rhs[1:-1]
+            settings.setdefault(key, rhs)
+    return settings
+
+
+def _get_settings() -> dict[str, str]:
+    """Return the parsed config file, re-reading it only when it has changed on disk."""
+    global _settings_cache
     path = _get_config_file_path()
+    st = os.stat(path)
+    key = (st.st_mtime_ns, st.st_size, st.st_ino)
+    cache = _settings_cache
+    if cache is not None and cache[0] == key:
+        return cache[1]
+    settings = _parse_config_file(path)
+    _settings_cache = (key, settings)
+    return settings
+
+
+def read_setting(name: str, default: str | None = None) -> str | None:
+    """Read a single setting from the config file. Returns `default` if not present.
+
+    The parsed file is memoized and only re-read when its mtime, size or inode
+    changes, so repeated calls in the main loop cost a single stat.
+    """
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if line.startswith(name + "="):
-                    # naive parsing: split at first = and strip quotes
-                    _, rhs = line.split("=", 1)
-                    rhs = rhs.strip()
-                    if rhs.startswith('"') and rhs.endswith('"'):
-                        return rhs[1:-1]
-                    if rhs.startswith("'") and rhs.endswith("'"):
-                        return rhs[1:-1]
-                    return rhs
+        return _get_settings().get(name, default)
     except Exception as exc:
         logging.debug("Failed to read setting %s: %s", name, exc)
     return default
 
 
+def _invalidate_settings_cache() -> None:
+    """Force the next read_setting call to re-parse the config file."""
+    global _settings_cache
+    _settings_cache = None
+
+
 def write_setting(name: str, value: str) -> None:
     """Write or update a setting in the config file atomically.
     
@@ -196,6 +230,7 @@ def write_setting(name: str, value: str) -> None:
         
         # Atomic rename (replaces old file only after new one is fully written, ensuring file integrity)
         shutil.move(tmp_path, path)
+        _invalidate_settings_cache()
         
     except Exception as e:
         # Clean up temp file if it exists
@@ -4,11 +4,13 @@ Provides IMAPClientWrapper class for managing IMAP connections,
 message retrieval, and IMAP IDLE support.
 """
 # Standard library imports
+import functools
 import imaplib
 import logging
 import sys
+import threading
 import time
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 # Workaround for Python 3.14+ where imaplib.IMAP4.file is a read-only property.
 # imapclient (older versions) tries to assign to .file and raises:
@@ -32,7 +34,22 @@ from imapclient import IMAPClient
 logger = logging.getLogger(__name__)
 
 
+def _locked(method):
+    """Run `method` while holding the wrapper's command lock."""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
 class IMAPClientWrapper:
+    """IMAP connection wrapper.
+
+    Commands are serialized with a lock so a background thread can prefetch
+    messages while the main thread processes the previous one.
+    """
+
     def __init__(self, host: str, port: int, user: str, password: str, mailbox: str = "INBOX", trash_mailbox: str = "Trash"):
         self.host = host
         self.port = port
@@ -41,7 +58,9 @@ class IMAPClientWrapper:
         self.mailbox = mailbox
         self.trash_mailbox = trash_mailbox
         self.client: Optional[IMAPClient] = None
+        self._lock = threading.RLock()
 
+    @_locked
     def connect(self) -> bool:
         logger.info("Connecting to IMAP %s:%s", self.host, self.port)
         try:
@@ -62,6 +81,7 @@ class IMAPClientWrapper:
             self.logout()
             return False
 
+    @_locked
     def logout(self):
         try:
             self.client.logout()
@@ -69,6 +89,7 @@ class IMAPClientWrapper:
             logger.debug("Logout exception (may be expected): %s", exc)
         self.client = None
 
+    @_locked
     def get_all_messages_uids(self) -> List[int]:
         """Return all message UIDs in the currently selected folder.
         
@@ -87,6 +108,7 @@ class IMAPClientWrapper:
             return []
         return uids
 
+    @_locked
     def fetch_message_bytes(self, uid: int) -> bytes:
         if not self.client:
             if not self.connect():
@@ -94,17 +116,69 @@ class IMAPClientWrapper:
         data = self.client.fetch([uid], ['RFC822'])
         msg = data[uid][b'RFC822']
         return msg
+
+    @_locked
+    def fetch_message_sizes(self, uids: List[int]) -> Dict[int, int]:
+        """Return the RFC822.SIZE of each of `uids` using a single UID FETCH."""
+        if not uids:
+            return {}
+        if not self.client:
+            if not self.connect():
+                raise ConnectionError("Failed to connect to IMAP server")
+        data = self.client.fetch(uids, ['RFC822.SIZE'])
+        sizes: Dict[int, int] = {}
+        for uid in uids:
+            size = data.get(uid, {}).get(b'RFC822.SIZE')
+            if size is not None:
+                sizes[uid] = size
+        return sizes
+
+    @_locked
+    def fetch_message_bytes_batch(self, uids: List[int], max_batch: int = 50) -> Dict[int, bytes]:
+        """Fetch several messages with one UID FETCH per `max_batch` UIDs.
+
+        UIDs the server does not return (e.g. already expunged) are missing
+        from the result.
+        """
+        if not self.client:
+            if not self.connect():
+                raise ConnectionError("Failed to connect to IMAP server")
+        messages: Dict[int, bytes] = {}
+        for i in range(0, len(uids), max_batch):
+            chunk = uids[i:i + max_batch]
+            data = self.client.fetch(chunk, ['BODY.PEEK[]'])
+            # The response may also carry unsolicited FETCH data (e.g. FLAGS
+            # updates) for other messages; only take the bodies we asked for
+            for uid in chunk:
+                body = data.get(uid, {}).get(b'BODY[]')
+                if body is not None:
+                    messages[uid] = body
+        return messages
     
-    def delete_message(self, uid: int) -> None:
+    @_locked
+    def delete_message(self, uid: int) -> bool:
+        return self.delete_messages([uid])
+
+    @_locked
+    def delete_messages(self, uids: List[int]) -> bool:
+        """Flag all `uids` as deleted with one UID STORE and expunge once.
+
+        Returns True if the messages were expunged.
+        """
+        if not uids:
+            return True
         if not self.client:
             if not self.connect():
-                return
+                return False
         try:
-            self.client.add_flags([uid], [b'\\Deleted'])
+            self.client.add_flags(uids, [b'\\Deleted'])
             self.client.expunge()
         except Exception as exc:
-            logger.exception("Failed to delete UID %s: %s", uid, exc)
+            logger.exception("Failed to delete UIDs %s: %s", uids, exc)
+            return False
+        return True
 
+    @_locked
     def empty_trash(self) -> None:
         if not self.client:
             if not self.connect():
@@ -125,6 +199,7 @@ class IMAPClientWrapper:
                 # best-effort restore
                 logger.debug("Failed to restore mailbox selection: %s", exc)
 
+    @_locked
     def idle_wait(self, timeout: int = 900, pollintervall: int = 300) -> bool:
         """Wait for new messages using IMAP IDLE. Returns True if new mail arrived.
         
@@ -4,11 +4,14 @@ Poll IMAP inbox for new messages, process image attachments,
 display on Inky e-paper display, and send email confirmations.
 """
 # Standard library imports
-import email
-import glob
+from concurrent.futures import Future, ThreadPoolExecutor
+from datetime import timedelta
+import functools
+import io
 import logging
 from logging.handlers import TimedRotatingFileHandler
 import os
+import signal
 import socket
 import subprocess
 import threading
@@ -18,13 +21,28 @@ import traceback
 # Third-party imports
 from PIL import Image, ImageOps
 
+# Optional SIMD resizer (bindings to the Rust fast_image_resize crate, with
+# NEON kernels on the Pi); Pillow is used when it is not installed
+try:
+    from cykooz_resizer import CropBox, FilterType, ResizeAlg, ResizeOptions, Resizer
+    _simd_resizer = Resizer()
+    _SIMD_RESIZE_ALG = ResizeAlg.convolution(FilterType.lanczos3)
+except Exception:
+    _simd_resizer = None
+
 # Local imports
 import config
 from imap_client import IMAPClientWrapper
 from processor import process_message_bytes
-from smtp_sender import send_reply, render_template, get_user_friendly_error
+from smtp_sender import SMTPSender, render_template, get_user_friendly_error
 from storage import UIDStore
 
+# Pillow >= 9.1 exposes these via the Image.Resampling/Image.Palette enums;
+# Pillow-SIMD and older Pillow releases only have the module-level constants.
+LANCZOS = getattr(Image, "Resampling", Image).LANCZOS
+BOX = getattr(Image, "Resampling", Image).BOX
+ADAPTIVE = getattr(Image, "Palette", Image).ADAPTIVE
+
 REBOOT_MIN_UPTIME_SECONDS = 60 * 60
 VERSION = "0.5"
 
@@ -148,6 +166,9 @@ def check_internet_connectivity(timeout_seconds: float = 5.0) -> bool:
     return False
 
 
+display_resolution: tuple[int, int] | None = None
+
+
 def init_display(ask_user: bool = False):
     """Initialize and return an Inky display instance or None on failure."""
     try:
@@ -166,6 +187,11 @@ def init_display(ask_user: bool = False):
         
         logging.info("Initialized Inky display - resolution: %s, colour: %s, module: %s", 
                      inky.resolution, inky.colour, type(inky).__module__)
+
+        # The resolution is fixed for the lifetime of the display; cache it so the
+        # image pipeline does not go through the driver's attribute on every call.
+        global display_resolution
+        display_resolution = tuple(inky.resolution)
         
         return inky
     except Exception as exc:
@@ -173,160 +199,312 @@ def init_display(ask_user: bool = False):
         return None
 
 
+# Keep at least this factor of the downscale for LANCZOS. 3.0 would be
+# indistinguishable from a pure LANCZOS resize; 2.0 roughly halves the resize
+# time and the loss is invisible after dithering to the e-paper palette.
+RESIZE_REDUCING_GAP = 2.0
+
+
+def _resize_lanczos(image: Image.Image, size: tuple, box: tuple) -> Image.Image:
+    """Lanczos-resize the `box` region of `image` to `size`.
+
+    Prefers the SIMD resizer when available. `box` is (left, top, right, bottom)
+    in source pixels and may be fractional.
+    """
+    if _simd_resizer is not None and image.mode in ("RGB", "RGBA", "L"):
+        try:
+            left, top, right, bottom = box
+            options = ResizeOptions(
+                resize_alg=_SIMD_RESIZE_ALG,
+                crop_box=CropBox(left, top, right - left, bottom - top),
+            )
+            resized = Image.new(image.mode, size)
+            _simd_resizer.resize_pil(image, resized, options)
+            return resized
+        except Exception as exc:
+            logging.debug("SIMD resize failed, falling back to Pillow: %s", exc)
+    # For large downscales, reducing_gap lets Pillow box-reduce by an integer
+    # factor first so the LANCZOS taps run over a much smaller image.
+    # Image.reduce() rejects 16-bit integer modes; resize those directly.
+    if image.mode.startswith("I;16"):
+        return image.resize(size, LANCZOS, box=box)
+    return image.resize(size, LANCZOS, box=box, reducing_gap=RESIZE_REDUCING_GAP)
+
+
 def _resize_and_crop(image: Image.Image, target_size: tuple) -> Image.Image:
     """Resize `image` to fill `target_size` while preserving aspect ratio.
     
     Center-crop any overflow so the result exactly matches `target_size`.
+    The crop is done in source coordinates and passed to the resampler as a
+    box, so only the kept pixels are resampled and no oversized intermediate
+    image is allocated.
     """
     target_w, target_h = target_size
     src_w, src_h = image.size
     if src_w == 0 or src_h == 0 or target_w == 0 or target_h == 0:
         return image.resize((target_w, target_h))
 
-    src_ratio = src_w / src_h
-    target_ratio = target_w / target_h
+    if (src_w, src_h) == (target_w, target_h):
+        # Already at display size (e.g. re-displaying a prepared image)
+        return image
 
-    # Determine scale factor to cover the target area
-    if src_ratio > target_ratio:
-        # source is wider -> scale by height
-        scale = target_h / src_h
+    # Largest centered source rectangle with the target aspect ratio
+    if src_w * target_h > src_h * target_w:
+        # source is wider -> keep full height
+        crop_w, crop_h = src_h * target_w / target_h, src_h
     else:
-        # source is taller (or matching) -> scale by width
-        scale = target_w / src_w
-
-    new_w = int(src_w * scale + 0.5)
-    new_h = int(src_h * scale + 0.5)
+        # source is taller (or matching) -> keep full width
+        crop_w, crop_h = src_w, src_w * target_h / target_w
+    left = (src_w - crop_w) / 2
+    top = (src_h - crop_h) / 2
+    box = (left, top, left + crop_w, top + crop_h)
+
+    int_box = tuple(int(v + 0.5) for v in box)
+    box_w = int_box[2] - int_box[0]
+    box_h = int_box[3] - int_box[1]
+    if (box_w, box_h) == (target_w, target_h):
+        # Source is already at display scale: a plain crop suffices
+        return image.crop(int_box)
+    if box_w % target_w == 0 and box_h % target_h == 0 and box_w // target_w == box_h // target_h > 1:
+        # Exact integer downscale: box averaging is much cheaper than LANCZOS
+        return image.resize((target_w, target_h), BOX, box=int_box)
 
     # Use a high-quality down/upsampling filter
-    resized = image.resize((new_w, new_h), Image.LANCZOS)
-
-    # Center-crop to target size
-    left = max(0, (new_w - target_w) // 2)
-    top = max(0, (new_h - target_h) // 2)
-    right = left + target_w
-    bottom = top + target_h
-
-    return resized.crop((left, top, right, bottom))
-
-
-def _apply_exif_orientation(image: Image.Image) -> tuple[Image.Image, bool]:
-    """Apply EXIF orientation transformation to an image.
+    return _resize_lanczos(image, (target_w, target_h), box)
+
+
+# Map EXIF orientation values to PIL transpose operations
+# Reference: https://exif.org/Exif2-2.PDF (page 37)
+EXIF_ORIENTATION_TRANSPOSE = {
+    1: None,  # Normal - no transformation needed
+    2: Image.FLIP_LEFT_RIGHT,  # Mirrored horizontally
+    3: Image.ROTATE_180,  # Rotated 180°
+    4: Image.FLIP_TOP_BOTTOM,  # Mirrored vertically
+    5: Image.TRANSPOSE,  # Mirrored horizontally + rotated 270° CCW
+    6: Image.ROTATE_270,  # Rotated 90° CW (270° CCW)
+    7: Image.TRANSVERSE,  # Mirrored horizontally + rotated 90° CCW
+    8: Image.ROTATE_90,  # Rotated 270° CW (90° CCW)
+}
+
+# Transpose operations that swap width and height
+AXIS_SWAPPING_TRANSPOSES = {Image.ROTATE_90, Image.ROTATE_270, Image.TRANSPOSE, Image.TRANSVERSE}
+
+# The single transpose equivalent to applying the key, then rotating 90° CCW
+# for portrait mode (same result as `.rotate(90, expand=True)` afterwards)
+THEN_ROTATE_90 = {
+    None: Image.ROTATE_90,
+    Image.FLIP_LEFT_RIGHT: Image.TRANSPOSE,
+    Image.FLIP_TOP_BOTTOM: Image.TRANSVERSE,
+    Image.ROTATE_90: Image.ROTATE_180,
+    Image.ROTATE_180: Image.ROTATE_270,
+    Image.ROTATE_270: None,
+    Image.TRANSPOSE: Image.FLIP_TOP_BOTTOM,
+    Image.TRANSVERSE: Image.FLIP_LEFT_RIGHT,
+}
+
+
+def _exif_orientation_transpose(image: Image.Image) -> tuple[int | None, bool]:
+    """Return the transpose operation that undoes the image's EXIF orientation.
     
-    Reads only the orientation tag (274) and applies the appropriate rotation/flip,
-    ignoring potentially corrupt size metadata that can cause exceptions.
+    Reads only the orientation tag (274) and ignores potentially corrupt size
+    metadata that can cause exceptions.
     
     Args:
-        image: PIL Image to orient
+        image: PIL Image to inspect
         
     Returns:
-        Tuple of (oriented_image, exif_failed)
-        - oriented_image: The transformed image (or original if no orientation data)
-        - exif_failed: True if EXIF orientation could not be applied
+        Tuple of (transpose_method, exif_failed)
+        - transpose_method: PIL transpose constant, or None if no transformation is needed
+        - exif_failed: True if EXIF orientation could not be determined
     """
     try:
         # Try to get EXIF data
         exif = image.getexif()
         if exif is None:
             logging.debug("No EXIF data found in image")
-            return image, False
+            return None, False
         
         # EXIF orientation tag is 274 (0x0112)
         orientation = exif.get(274)
         if orientation is None:
             logging.debug("No EXIF orientation tag found")
-            return image, False
+            return None, False
         
         logging.debug("EXIF orientation tag detected: %d", orientation)
         
-        # Map EXIF orientation values to PIL transpose operations
-        # Reference: https://exif.org/Exif2-2.PDF (page 37)
-        orientation_transforms = {
-            1: None,  # Normal - no transformation needed
-            2: Image.FLIP_LEFT_RIGHT,  # Mirrored horizontally
-            3: Image.ROTATE_180,  # Rotated 180°
-            4: Image.FLIP_TOP_BOTTOM,  # Mirrored vertically
-            5: Image.TRANSPOSE,  # Mirrored horizontally + rotated 270° CCW
-            6: Image.ROTATE_270,  # Rotated 90° CW (270° CCW)
-            7: Image.TRANSVERSE,  # Mirrored horizontally + rotated 90° CCW
-            8: Image.ROTATE_90,  # Rotated 270° CW (90° CCW)
-        }
+        if orientation not in EXIF_ORIENTATION_TRANSPOSE:
+            logging.warning("Unknown EXIF orientation value: %d", orientation)
+            return None, True
+        if orientation == 1:
+            logging.debug("Image has normal orientation, no transformation needed")
+        return EXIF_ORIENTATION_TRANSPOSE[orientation], False
         
-        transform = orientation_transforms.get(orientation)
-        if transform is None:
-            if orientation == 1:
-                logging.debug("Image has normal orientation, no transformation needed")
-                return image, False
-            else:
-                logging.warning("Unknown EXIF orientation value: %d", orientation)
-                return image, True
+    except Exception as exc:
+        logging.warning("Failed to read EXIF orientation: %s", exc)
+        return None, True
+
+
+def _draft_for_target(image: Image.Image, target_size: tuple) -> None:
+    """Ask the JPEG decoder to downscale by 1/2, 1/4 or 1/8 during decoding.
+
+    The decoded image still covers `target_size`, which must be given in the
+    orientation of the stored pixels. This is only a hint: non-JPEG images are
+    left untouched.
+    """
+    try:
+        image.draft("RGB", tuple(target_size))
+    except Exception as exc:
+        logging.debug("Image draft hint failed: %s", exc)
+
+
+def _encode_preview(preview_image: Image.Image, preview_palette: tuple | None, image_path: str) -> bytes | None:
+    """Encode the preview as palette PNG bytes; returns None on failure.
+
+    The preview is quantized to `preview_palette` (flat RGB values of the
+    display's colours) when given, else to an adaptive palette.
+    """
+    try:
+        # Save to in-memory buffer instead of file. An 8-bit palette image is a
+        # third of the RGB data for zlib, and fast compression is plenty for an
+        # email preview. Quantizing to the panel's own colours also shows the
+        # sender what the frame will actually look like.
+        if preview_palette:
+            palette_image = Image.new("P", (1, 1))
+            palette_image.putpalette(preview_palette)
+            preview_image = preview_image.convert("RGB").quantize(palette=palette_image)
+        else:
+            preview_image = preview_image.convert("RGB").convert("P", palette=ADAPTIVE)
+        buffer = io.BytesIO()
+        preview_image.save(buffer, format="PNG", optimize=False, compress_level=1)
+        preview_data = buffer.getvalue()
+        logging.debug("Created preview image data: %d bytes", len(preview_data))
+        return preview_data
+    except Exception as exc:
+        logging.exception("Failed to create preview image data for %s: %s", image_path, exc)
+        return None
+
+
+# Preview PNGs are encoded off the main thread so zlib overlaps with the SMTP
+# handshake of the reply and with the display refresh
+_preview_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="preview-encode")
+
+
+@functools.lru_cache(maxsize=4)
+def _prepare_image_cached(image_path: str, mtime_ns: int, portrait: bool, resolution: tuple, with_preview: bool, preview_palette: tuple | None = None) -> tuple[Image.Image, Future | None, tuple[str, ...]]:
+    """Open, orient and resize an image and, if `with_preview`, start encoding its PNG preview.
+
+    The preview is encoded on the preview worker; the returned future resolves
+    to the PNG bytes (or None if encoding failed). See `_encode_preview` for
+    `preview_palette`.
+
+    Results are memoized per (path, mtime, orientation, resolution, preview), so toggling
+    the orientation back and forth or redrawing the same file skips the decode,
+    LANCZOS resize and PNG encode. `mtime_ns` is only part of the key: a file
+    that is rewritten gets a new entry. Callers must not mutate the returned image.
+
+    Returns:
+        Tuple of (resized_image, preview_future, warnings)
+    """
+    warnings_list = []
+    # Decode in one sequential pass and release the file handle as soon as the
+    # pixels are loaded; only the resized result outlives this block.
+    with Image.open(image_path) as image:
+        # Determine EXIF orientation using custom logic that ignores corrupt size metadata
+        exif_method, exif_failed = _exif_orientation_transpose(image)
         
-        # Apply the transformation
-        oriented_image = image.transpose(transform)
-        logging.debug("Applied EXIF orientation transformation: %d", orientation)
-        return oriented_image, False
+        if exif_failed:
+            warnings_list.append("EXIF orientation data could not be applied. Please check the preview to verify your image displays correctly.")
         
+        # If set to portrait mode the display image is additionally rotated 90 degrees.
+        # Both rotations are folded into one transpose which is applied only after
+        # resizing, so the full-size source is never rotated. Resizing therefore
+        # happens in the orientation of the stored pixels.
+        display_method = THEN_ROTATE_90[exif_method] if portrait else exif_method
+        target_w, target_h = resolution
+        if display_method in AXIS_SWAPPING_TRANSPOSES:
+            target_w, target_h = target_h, target_w
+
+        # Decode JPEGs at a reduced scale that still covers the display resolution
+        _draft_for_target(image, (target_w, target_h))
+        image.load()
+        resized_stored = _resize_and_crop(image, (target_w, target_h))
+
+    resized_image = resized_stored
+    if display_method is not None:
+        resized_image = resized_stored.transpose(display_method)
+        logging.debug("Applied orientation transpose: %s", display_method)
+    
+    # Create preview image data (PNG bytes) to email back - no disk write!
+    if not with_preview:
+        return resized_image, None, tuple(warnings_list)
+
+    # The preview shows the picture upright, i.e. with only the EXIF orientation applied
+    if exif_method == display_method:
+        preview_image = resized_image
+    elif exif_method is None:
+        preview_image = resized_stored
+    else:
+        preview_image = resized_stored.transpose(exif_method)
+    preview_future = _preview_executor.submit(_encode_preview, preview_image, preview_palette, image_path)
+
+    return resized_image, preview_future, tuple(warnings_list)
+
+
+def _display_palette(inky, saturation: float) -> tuple | None:
+    """Return the flat RGB palette the Inky driver quantizes to, or None if unknown.
+
+    Colour Inky drivers blend their saturated and desaturated palettes in
+    `_palette_blend`, which is what `set_image` uses internally.
+    """
+    palette_blend = getattr(inky, "_palette_blend", None)
+    if palette_blend is None:
+        return None
+    try:
+        return tuple(int(v) for v in palette_blend(saturation))
     except Exception as exc:
-        logging.warning("Failed to read or apply EXIF orientation: %s", exc)
-        return image, True
+        logging.debug("Failed to read display palette: %s", exc)
+        return None
 
 
-def prepare_image_for_display(inky, image_path: str):
+def prepare_image_for_display(inky, image_path: str, with_preview: bool = True):
     """Prepare an image for display: load, orient, resize, and create preview data.
+
+    The PNG preview is only encoded when `with_preview` is set; otherwise
+    preview_future is None. Encoding runs in the background and the future
+    resolves to the PNG bytes, or None if encoding failed.
     
     Returns:
-        Tuple of (resized_image, preview_data, original_image, error_message, warnings_list)
-        On success: (Image, bytes, Image, None, [warnings])
-        On failure: (None, None, None, error_string, [])
+        Tuple of (resized_image, preview_future, error_message, warnings_list)
+        On success: (Image, Future, None, [warnings])
+        On failure: (None, None, error_string, [])
     """
     if inky is None:
         error_msg = "No Inky display available; cannot prepare image"
         logging.warning("%s for %s", error_msg, image_path)
-        return None, None, None, error_msg, []
+        return None, None, error_msg, []
     
     try:
-        import io
-        
-        warnings_list = []
-        image = Image.open(image_path)
-        
-        # Apply EXIF orientation using custom logic that ignores corrupt size metadata
-        oriented_image, exif_failed = _apply_exif_orientation(image)
-        
-        if exif_failed:
-            warnings_list.append("EXIF orientation data could not be applied. Please check the preview to verify your image displays correctly.")
-        
-        # If set to portrait mode rotate the image 90 degrees before applying display size
         try:
-            if config.read_setting("ORIENTATION", "landscape") == "portrait":
-                oriented_image = oriented_image.rotate(90, expand=True)
+            portrait = config.read_setting("ORIENTATION", "landscape") == "portrait"
         except Exception as exc:
-            logging.debug("Failed to apply orientation rotation: %s", exc)
-        resized_image = _resize_and_crop(oriented_image, inky.resolution)
-        
-        # Create preview image data (PNG bytes) to email back - no disk write!
-        preview_data = None
-        try:
-            preview_image = resized_image
-            if config.read_setting("ORIENTATION", "landscape") == "portrait":
-                preview_image = preview_image.rotate(-90, expand=True)
-            
-            # Save to in-memory buffer instead of file
-            buffer = io.BytesIO()
-            preview_image.save(buffer, format="PNG")
-            preview_data = buffer.getvalue()
-            logging.debug("Created preview image data: %d bytes", len(preview_data))
-        except Exception as exc:
-            logging.exception("Failed to create preview image data for %s: %s", image_path, exc)
+            logging.debug("Failed to read orientation setting: %s", exc)
+            portrait = False
+
+        abs_path = os.path.abspath(image_path)
+        mtime_ns = os.stat(abs_path).st_mtime_ns
+        resolution = display_resolution or tuple(inky.resolution)
+        preview_palette = _display_palette(inky, get_saturation()) if with_preview else None
+        resized_image, preview_future, warnings = _prepare_image_cached(abs_path, mtime_ns, portrait, resolution, with_preview, preview_palette)
         
         logging.info("Prepared image for display: %s", image_path)
-        return resized_image, preview_data, image, None, warnings_list
+        return resized_image.copy(), preview_future, None, list(warnings)
     except Exception as exc:
         error_msg = f"Failed to prepare image: {type(exc).__name__}: {str(exc)}"
         logging.exception("Failed to prepare image %s: %s", image_path, exc)
-        return None, None, None, error_msg, []
+        return None, None, error_msg, []
 
 
-def display_image(inky, prepared_image: Image.Image, image_path: str, original_image: Image.Image | None = None, saturation: float = 0.5) -> bool:
+def display_image(inky, prepared_image: Image.Image, image_path: str, saturation: float = 0.5) -> bool:
     """Display a prepared image on the Inky display."""
     if inky is None:
         logging.warning("No Inky display available; skipping display for %s", image_path)
@@ -368,16 +546,11 @@ def display_image(inky, prepared_image: Image.Image, image_path: str, original_i
             logging.exception("CAUGHT EXCEPTION in inky.show(): %s (type: %s)", exc, type(exc).__name__)
             raise
         
-        # Track the currently displayed image and its source path so other
-        # parts of the program can rotate/reapply it when orientation changes.
-        try:
-            # store originals (not the resized image) for better-quality rotations
-            global current_image, current_image_path
-            if original_image is not None:
-                current_image = original_image.copy()
-            current_image_path = image_path
-        except Exception as exc:
-            logging.debug("Failed to set current_image globals: %s", exc)
+        # Track only the source path of the currently displayed image so other
+        # parts of the program can reopen and reapply it when orientation changes.
+        # Keeping a copy of the decoded original would pin tens of MB of RAM.
+        global current_image_path
+        current_image_path = image_path
         
         return True
     except Exception as exc:
@@ -385,19 +558,103 @@ def display_image(inky, prepared_image: Image.Image, image_path: str, original_i
         return False
 
 
-current_image: Image.Image | None = None
 current_image_path: str | None = None
 
 
+# All panel access goes through one worker: inky.show() blocks for 15-30 seconds,
+# and serializing on it keeps the button thread from refreshing concurrently
+_display_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="display")
+
+# The newest image waiting for the display worker, as display_image arguments.
+# A single slot: an image superseded before the worker gets to it is never
+# shown, so at most one prepared image waits behind the one being displayed.
+_pending_display: tuple | None = None
+_pending_display_lock = threading.Lock()
+
+
+def _show_pending_display() -> bool:
+    global _pending_display
+    with _pending_display_lock:
+        job, _pending_display = _pending_display, None
+    if job is None:
+        # Already shown by an earlier queued run
+        return False
+    return display_image(*job)
+
+
+def pending_display_path() -> str | None:
+    """Return the path of the image waiting to be displayed, if any."""
+    with _pending_display_lock:
+        return _pending_display[2] if _pending_display is not None else None
+
+
+def display_image_async(inky, prepared_image: Image.Image, image_path: str, saturation: float = 0.5) -> Future:
+    """Queue `prepared_image` for the display worker and return the future of its run.
+
+    Replaces any image still waiting in the queue.
+    """
+    global _pending_display
+    with _pending_display_lock:
+        if _pending_display is not None:
+            logging.info("Skipping display of %s; superseded by %s", _pending_display[2], image_path)
+        _pending_display = (inky, prepared_image, image_path, saturation)
+    return _display_executor.submit(_show_pending_display)
+
+
+# Upper bounds for one UID FETCH batch. A message larger than the byte budget
+# is fetched on its own, and never alongside a prefetched batch.
+IMAP_FETCH_BATCH = 5
+IMAP_FETCH_BATCH_BYTES = 8 * 1024 * 1024
+
+
+def _plan_fetch_batches(uids: list[int], sizes: dict[int, int]) -> list[tuple[list[int], int]]:
+    """Group `uids` into (batch, total_bytes) pairs bounded by count and size.
+
+    UIDs of unknown size are counted as a full byte budget.
+    """
+    batches: list[tuple[list[int], int]] = []
+    batch: list[int] = []
+    batch_bytes = 0
+    for uid in uids:
+        size = sizes.get(uid, IMAP_FETCH_BATCH_BYTES)
+        if batch and (len(batch) >= IMAP_FETCH_BATCH or batch_bytes + size > IMAP_FETCH_BATCH_BYTES):
+            batches.append((batch, batch_bytes))
+            batch, batch_bytes = [], 0
+        batch.append(uid)
+        batch_bytes += size
+    if batch:
+        batches.append((batch, batch_bytes))
+    return batches
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".gif"}
+
+
 def _find_latest_image(data_dir: str) -> str | None:
-    patterns = ["*.jpg", "*.jpeg", "*.png", "*.bmp", "*.gif"]
-    files = []
-    for pat in patterns:
-        files.extend(glob.glob(os.path.join(data_dir, pat)))
-    if not files:
+    """Return the most recently modified image in `data_dir`, or None.
+
+    Single `os.scandir` pass keeping the running maximum, instead of one glob
+    per extension followed by a stat-keyed sort.
+    """
+    latest_path = None
+    latest_mtime = -1.0
+    try:
+        with os.scandir(data_dir) as it:
+            for entry in it:
+                if os.path.splitext(entry.name)[1].lower() not in IMAGE_EXTENSIONS:
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    mtime = entry.stat().st_mtime
+                except OSError:
+                    continue
+                if mtime > latest_mtime:
+                    latest_mtime = mtime
+                    latest_path = entry.path
+    except OSError as exc:
+        logging.debug("Failed to scan %s for images: %s", data_dir, exc)
         return None
-    files.sort(key=lambda p: os.path.getmtime(p), reverse=True)
-    return files[0]
+    return latest_path
 
 def get_saturation() -> float:
     """Get the saturation setting from config, defaulting to 0.5 on error."""
@@ -424,27 +681,28 @@ def toggle_orientation_and_apply(inky) -> None:
         config.write_setting("ORIENTATION", new)
         logging.info("Orientation toggled: %s -> %s", old, new)
 
-        # Attempt to rotate the currently loaded image
-        global current_image, current_image_path
-        if current_image is not None:
+        # Attempt to reopen and rotate the image that is waiting to be shown
+        # (prepared in the old orientation) or else the currently displayed one
+        image_path = pending_display_path() or current_image_path
+        if image_path is not None and os.path.exists(image_path):
             try:
-                prepared, _, orig, error, _ = prepare_image_for_display(inky, current_image_path)
+                prepared, _, error, _ = prepare_image_for_display(inky, image_path, with_preview=False)
                 if prepared:
-                    display_image(inky, prepared, current_image_path, orig, get_saturation())
-                    logging.info("Reapplied current_image after orientation toggle")
+                    display_image_async(inky, prepared, image_path, get_saturation()).result()
+                    logging.info("Reapplied current image after orientation toggle")
                     return
                 elif error:
                     logging.error("Failed to prepare current image: %s", error)
             except Exception as exc:
-                logging.exception("Failed to rotate/reapply current_image: %s", exc)
+                logging.exception("Failed to rotate/reapply current image: %s", exc)
 
         # If we don't have a current image, try to display the most recent one
         latest = _find_latest_image(config.read_setting("DATA_DIR", "/mnt/usb/data"))
         if latest:
             logging.info("No current image available; showing latest: %s", latest)
-            prepared, _, orig, error, _ = prepare_image_for_display(inky, latest)
+            prepared, _, error, _ = prepare_image_for_display(inky, latest, with_preview=False)
             if prepared:
-                display_image(inky, prepared, latest, orig, get_saturation())
+                display_image_async(inky, prepared, latest, get_saturation()).result()
                 logging.info("Applied latest image after orientation toggle")
                 return
             elif error:
@@ -455,6 +713,10 @@ def toggle_orientation_and_apply(inky) -> None:
         logging.exception("toggle_orientation_and_apply failed: %s", exc)
 
 
+# Contact bounce of the tactile switches settles well within this window
+BUTTON_DEBOUNCE_MS = 20
+
+
 def _monitor_buttons_thread(inky) -> None:
     try:
         import gpiod
@@ -485,7 +747,9 @@ def _monitor_buttons_thread(inky) -> None:
 
         logging.info("Button GPIO mapping: A=%d B=%d C=%d D=%d (detected_inky_module=%s)", SW_A, SW_B, SW_C, SW_D, detected_str)
 
-        INPUT = gpiod.LineSettings(direction=Direction.INPUT, bias=Bias.PULL_UP, edge_detection=Edge.FALLING)
+        # Let the kernel filter contact bounce so one press yields one edge event
+        INPUT = gpiod.LineSettings(direction=Direction.INPUT, bias=Bias.PULL_UP, edge_detection=Edge.FALLING,
+                                   debounce_period=timedelta(milliseconds=BUTTON_DEBOUNCE_MS))
 
         chip = gpiodevice.find_chip_by_platform()
         OFFSETS = [chip.line_offset_from_id(id) for id in BUTTONS]
@@ -514,10 +778,11 @@ def _monitor_buttons_thread(inky) -> None:
             except Exception as exc:
                 logging.exception("Error handling button event: %s", exc)
 
+        # Block in the kernel until an edge arrives instead of polling
         while True:
-            for event in request.read_edge_events():
-                handle_button(event)
-            time.sleep(0.01)
+            if request.wait_edge_events():
+                for event in request.read_edge_events():
+                    handle_button(event)
     except Exception as exc:
         logging.exception("Button monitor thread could not start (gpiod/gpiodevice may be unavailable): %s", exc)
 
@@ -610,128 +875,236 @@ def run_git_update(repo_path: str) -> None:
         logging.exception("Failed to update repo at %s", repo_path)
 
 
-def process_uids(uids: list[int], last_uid: int, imap: IMAPClientWrapper, inky, store: UIDStore) -> int:
-    """Process a list of message UIDs: fetch, process attachments, send replies, and display images."""
-    for uid in sorted(uids):
-        if uid <= last_uid:
-            continue
+# A single worker keeps replies in order while the display refreshes in parallel
+_reply_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="smtp-reply")
+
+
+def send_reply_async(description: str, send, *args, **kwargs) -> Future:
+    """Queue `send(*args, **kwargs)` on the reply worker and return immediately.
+
+    The e-paper refresh in `inky.show()` takes 15-30 seconds, so replies are
+    sent in the background instead of serializing with it. Success and failure
+    are logged using `description`.
+    """
+    def _run() -> None:
         try:
-            raw = imap.fetch_message_bytes(uid)
-            logging.info("Fetched UID %s (%d bytes)", uid, len(raw) if raw is not None else 0)
-
-            from_addr = email.message_from_bytes(raw).get('From')
-            logging.info("Message UID %s from: %s", uid, from_addr)
-
-            # Read SMTP configuration
-            smtp_host = config.read_setting("SMTP_HOST", "")
-            smtp_port = config.read_setting_int("SMTP_PORT", 587)
-            smtp_user = config.read_setting("SMTP_USER", "")
-            smtp_pass = config.read_setting("SMTP_PASS", "")
-            device_name = config.read_setting("DEVICE_NAME", "Mein Bilderrahmen")
-
-            res = process_message_bytes(
-                raw,
-                config.read_setting("TMP_DIR", "/mnt/usb/system/tmp"),
-                config.read_setting("DATA_DIR", "/mnt/usb/data"),
-                config.read_setting_int("ATTACHMENT_MAX_BYTES", 20971520)
-            )
-            logging.info("Processing result for UID %s: %s", uid, res)
+            send(*args, **kwargs)
+            logging.info("Sent %s", description)
+        except Exception:
+            logging.exception("Failed to send %s", description)
 
-            prepared_image = None
-            original_image = None
-            image_path = None
+    return _reply_executor.submit(_run)
 
-            if res.get("ok"):
-                # Step 1: Prepare the image for display (but don't show it yet)
-                preview_data = None
-                image_preparation_failure_message = ""
-                warnings = []
-                try:
-                    paths = res.get("paths", []) or []
-                    if paths:
-                        image_path = paths[0]
-                        prepared_image, preview_data, original_image, prep_error, warnings = prepare_image_for_display(inky, image_path)
-                        if prep_error:
-                            image_preparation_failure_message = prep_error
-                        logging.info("Prepared image for UID %s: %s", uid, image_path)
-                except Exception:
-                    image_preparation_failure_message = f"Failed to prepare image for UID {uid} with exception:\n{traceback.format_exc()}"
-                    logging.exception(image_preparation_failure_message)
 
-                # Step 2A: Send success/failure reply with preview before displaying
-                try:
-                    if preview_data:
-                        # Build warning HTML if there are warnings
-                        warning_html = ""
-                        if warnings:
-                            warning_items = "".join([f"<li>{w}</li>" for w in warnings])
-                            warning_html = f'''<div class="warning-box">
-                                    <p><strong>⚠️ Notice:</strong></p>
-                                    <ul>
-                                        {warning_items}
-                                    </ul>
-                                </div>'''
-                        
-                        # Pass in-memory image data as tuple (data, filename, mimetype)
-                        html = render_template("email_success_with_preview.html", image_cid="preview_image", device_name=device_name, warning_html=warning_html)
-                        send_reply(smtp_host, smtp_port, smtp_user, smtp_pass, from_addr,
-                            f"{device_name}: Image received", "Your image was received and stored.",
-                            attachments=[(preview_data, "preview.png", "image/png")],
-                            html_body=html
-                        )
-                    else:
-                        html = render_template("email_image_prep_failure.html", reason=image_preparation_failure_message, device_name=device_name)
-                        send_reply(smtp_host, smtp_port, smtp_user, smtp_pass, from_addr,
-                            f"{device_name}: Failed to prepare image", image_preparation_failure_message,
-                            html_body=html
-                        )
-                    logging.info("Sent success reply for UID %s to %s", uid, from_addr)
-                except Exception:
-                    logging.exception("Failed to send success reply for UID %s to %s", uid, from_addr)
-            else:
-                # Step 2B: Send failure reply
-                try:
-                    error_code = res.get('reason')
-                    error_message = get_user_friendly_error(error_code)
-                    html = render_template("email_failure.html", error_message=error_message, device_name=device_name)
-                    send_reply(smtp_host, smtp_port, smtp_user, smtp_pass, from_addr,
-                        f"{device_name}: Image processing failed",
-                        f"Reason: {error_message}",
-                        html_body=html
-                    )
-                    logging.info("Sent failure reply for UID %s to %s (reason=%s)", uid, from_addr, res.get('reason'))
-                except Exception:
-                    logging.exception("Failed to send error reply for UID %s", uid)
+def _send_success_reply(smtp: SMTPSender, to_addr: str, device_name: str, warning_html: str, preview_future: Future | None) -> None:
+    """Send the success reply, embedding the preview once it has been encoded.
 
-            # Step 3: Cleanup
-            try:
-                imap.delete_message(uid)
-                logging.info("Deleted UID %s from mailbox", uid)
-            except Exception:
-                logging.exception("Failed to delete UID %s", uid)
+    Runs on the reply worker. The SMTP session is established first so the TLS
+    handshake overlaps with the PNG encode still running on the preview worker.
+    """
+    smtp.ensure_connected()
+    preview_data = preview_future.result() if preview_future is not None else None
+    if preview_data:
+        # Pass in-memory image data as tuple (data, filename, mimetype)
+        html = render_template("email_success_with_preview.html", image_cid="preview_image", device_name=device_name, warning_html=warning_html)
+        attachments = [(preview_data, "preview.png", "image/png")]
+    else:
+        # Preview disabled via PREVIEW_REPLY (or its encoding failed)
+        html = render_template("email_success.html", device_name=device_name, warning_html=warning_html)
+        attachments = None
+    smtp.send(to_addr,
+        f"{device_name}: Image received", "Your image was received and stored.",
+        attachments=attachments,
+        html_body=html
+    )
+
+
+# Handled messages whose delete failed. They are already below last_uid and are
+# never processed (or replied to) again; only the delete is retried.
+_undeleted_uids: set[int] = set()
 
-            try:
-                imap.empty_trash()
-                logging.info("Emptied trash mailbox '%s'", config.read_setting("TRASH", "Trash"))
-            except Exception:
-                logging.warning("Failed to empty trash after deleting UID %s", uid)
 
-            # Step 4: Now display the image on the screen
+def _delete_handled_messages(imap: IMAPClientWrapper, uids: list[int]) -> None:
+    """Delete `uids` plus any earlier undeleted UIDs, then empty the trash."""
+    to_delete = sorted(_undeleted_uids.union(uids))
+    if not to_delete:
+        return
+    if not imap.delete_messages(to_delete):
+        _undeleted_uids.update(to_delete)
+        logging.error("Failed to delete UIDs %s; will retry the delete on the next check", to_delete)
+        return
+    _undeleted_uids.clear()
+    logging.info("Deleted UIDs %s from mailbox", to_delete)
+
+    try:
+        imap.empty_trash()
+        logging.info("Emptied trash mailbox '%s'", config.read_setting("TRASH", "Trash"))
+    except Exception:
+        logging.warning("Failed to empty trash after deleting UIDs %s", to_delete)
+
+
+def process_uids(uids: list[int], last_uid: int, imap: IMAPClientWrapper, smtp: SMTPSender, inky, store: UIDStore) -> int:
+    """Process a list of message UIDs: fetch, process attachments, send replies, and display images.
+
+    Messages are fetched in size-bounded batches with one UID FETCH each. While
+    a batch is processed, the next one is prefetched on a background thread as
+    long as both fit the byte budget, so at most two budgets' worth (or one
+    oversized message) of raw mail is held in memory.
+    """
+    pending = [uid for uid in sorted(uids) if uid > last_uid]
+    if not pending:
+        # Still retry deletes that failed during an earlier check
+        _delete_handled_messages(imap, [])
+        return last_uid
+
+    processed_uids: list[int] = []
+
+    # Settings are read once per mailbox check rather than once per message
+    data_dir = config.read_setting("DATA_DIR", "/mnt/usb/data")
+    max_bytes = config.read_setting_int("ATTACHMENT_MAX_BYTES", 20971520)
+    device_name = config.read_setting("DEVICE_NAME", "Mein Bilderrahmen")
+    with_preview = config.read_setting("PREVIEW_REPLY", "true") == "true"
+
+    try:
+        sizes = imap.fetch_message_sizes(pending)
+    except Exception:
+        logging.exception("Failed to fetch sizes of UIDs %s; fetching one at a time", pending)
+        sizes = {}
+    batches = _plan_fetch_batches(pending, sizes)
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="imap-prefetch") as prefetch:
+        next_fetch = None
+        for index, (batch, batch_bytes) in enumerate(batches):
+            current_fetch = next_fetch or prefetch.submit(imap.fetch_message_bytes_batch, batch)
+            next_fetch = None
+            if index + 1 < len(batches):
+                next_batch, next_bytes = batches[index + 1]
+                if batch_bytes <= IMAP_FETCH_BATCH_BYTES and next_bytes <= IMAP_FETCH_BATCH_BYTES:
+                    next_fetch = prefetch.submit(imap.fetch_message_bytes_batch, next_batch)
             try:
-                if prepared_image and image_path:
-                    display_image(inky, prepared_image, image_path, original_image, get_saturation())
-                    logging.info("Displayed image for UID %s: %s", uid, image_path)
+                raws = current_fetch.result()
             except Exception:
-                logging.exception("Failed to display image for UID %s", uid)
+                logging.exception("Failed to fetch UIDs %s", batch)
+                continue
+            # The future would otherwise keep the raw messages alive
+            del current_fetch
+            for uid in batch:
+                try:
+                    raw = raws.pop(uid, None)
+                    if raw is None:
+                        logging.warning("UID %s was not returned by the server; skipping", uid)
+                        continue
+                    logging.info("Fetched UID %s (%d bytes)", uid, len(raw) if raw is not None else 0)
+
+                    res = process_message_bytes(raw, data_dir, max_bytes)
+                    # Drop the raw message (often several MB) before decoding the image for display
+                    del raw
+                    logging.info("Processing result for UID %s: %s", uid, res)
+
+                    from_addr = res.get("from_addr")
+                    logging.info("Message UID %s from: %s", uid, from_addr)
+
+                    prepared_image = None
+                    image_path = None
+
+                    if res.get("ok"):
+                        # Step 1: Prepare the image for display (but don't show it yet)
+                        preview_future = None
+                        image_preparation_failure_message = ""
+                        warnings = []
+                        try:
+                            paths = res.get("paths", []) or []
+                            if paths:
+                                image_path = paths[0]
+                                prepared_image, preview_future, prep_error, warnings = prepare_image_for_display(
+                                    inky, image_path, with_preview=with_preview)
+                                if prep_error:
+                                    image_preparation_failure_message = prep_error
+                                logging.info("Prepared image for UID %s: %s", uid, image_path)
+                        except Exception:
+                            image_preparation_failure_message = f"Failed to prepare image for UID {uid} with exception:\n{traceback.format_exc()}"
+                            logging.exception(image_preparation_failure_message)
 
-            last_uid = max(last_uid, uid)
-            store.set_last_uid(last_uid)
+                        # Step 2A: Queue success/failure reply with preview; it is sent while the display refreshes
+                        try:
+                            if prepared_image is not None:
+                                # Build warning HTML if there are warnings
+                                warning_html = ""
+                                if warnings:
+                                    warning_items = "".join([f"<li>{w}</li>" for w in warnings])
+                                    warning_html = f'''<div class="warning-box">
+                                            <p><strong>⚠️ Notice:</strong></p>
+                                            <ul>
+                                                {warning_items}
+                                            </ul>
+                                        </div>'''
+                        
+                                send_reply_async(f"success reply for UID {uid} to {from_addr}",
+                                    _send_success_reply, smtp, from_addr, device_name, warning_html, preview_future)
+                            else:
+                                html = render_template("email_image_prep_failure.html", reason=image_preparation_failure_message, device_name=device_name)
+                                send_reply_async(f"image preparation failure reply for UID {uid} to {from_addr}",
+                                    smtp.send, from_addr,
+                                    f"{device_name}: Failed to prepare image", image_preparation_failure_message,
+                                    html_body=html
+                                )
+                            logging.info("Queued reply for UID %s to %s", uid, from_addr)
+                        except Exception:
+                            logging.exception("Failed to queue success reply for UID %s to %s", uid, from_addr)
+                    else:
+                        # Step 2B: Queue failure reply
+                        try:
+                            error_code = res.get('reason')
+                            error_message = get_user_friendly_error(error_code)
+                            html = render_template("email_failure.html", error_message=error_message, device_name=device_name)
+                            send_reply_async(f"failure reply for UID {uid} to {from_addr} (reason={error_code})",
+                                smtp.send, from_addr,
+                                f"{device_name}: Image processing failed",
+                                f"Reason: {error_message}",
+                                html_body=html
+                            )
+                            logging.info("Queued failure reply for UID %s to %s (reason=%s)", uid, from_addr, error_code)
+                        except Exception:
+                            logging.exception("Failed to queue error reply for UID %s", uid)
+
+                    # Step 3: Schedule cleanup; messages are deleted in one batch after the loop
+                    processed_uids.append(uid)
+
+                    # Step 4: Queue the image for the display worker; the next message is
+                    # fetched and processed while the panel refreshes
+                    try:
+                        if prepared_image and image_path:
+                            display_image_async(inky, prepared_image, image_path, get_saturation())
+                            logging.info("Queued image for display for UID %s: %s", uid, image_path)
+                    except Exception:
+                        logging.exception("Failed to queue image for display for UID %s", uid)
+
+                except Exception:
+                    logging.exception("Failed to process UID %s", uid)
+
+    # Cleanup: delete all handled messages with a single STORE/EXPUNGE and
+    # empty the trash once per batch rather than once per message. last_uid is
+    # recorded only after the delete was attempted, so a crash before it leaves
+    # the messages above last_uid instead of stranding them in INBOX.
+    _delete_handled_messages(imap, processed_uids)
+    if processed_uids:
+        last_uid = max(last_uid, max(processed_uids))
+        store.set_last_uid(last_uid)
+
+        # One durable write per batch, once the mailbox cleanup is done
+        try:
+            store.flush()
         except Exception:
-            logging.exception("Failed to process UID %s", uid)
-    
+            logging.exception("Failed to save last UID %s", last_uid)
+
     return last_uid
 
 
+def _exit_on_sigterm(signum, frame) -> None:
+    logging.info("Received signal %s; shutting down", signum)
+    raise SystemExit(0)
+
+
 def main() -> None:
     config.load_config()
     setup_logging(config.read_setting("LOG_LEVEL", "INFO"))
@@ -777,6 +1150,18 @@ def main() -> None:
         logging.exception("Failed to connect to IMAP server; aborting") # We might want to show an error on the display here
         return
 
+    # One SMTP session is reused for all replies; it connects lazily on the first send
+    smtp = SMTPSender(
+        config.read_setting("SMTP_HOST", ""),
+        config.read_setting_int("SMTP_PORT", 587),
+        config.read_setting("SMTP_USER", ""),
+        config.read_setting("SMTP_PASS", ""),
+    )
+
+    # Turn SIGTERM (e.g. systemctl stop) into SystemExit so the cleanup below
+    # runs: pending UID state is flushed and the SMTP session is quit cleanly
+    signal.signal(signal.SIGTERM, _exit_on_sigterm)
+
     try:
         # Check for any existing messages first
         try:
@@ -787,7 +1172,7 @@ def main() -> None:
             uids = []
         
         # Process existing messages
-        last_uid = process_uids(uids, last_uid, imap, inky, store)
+        last_uid = process_uids(uids, last_uid, imap, smtp, inky, store)
         
         # Main loop with fallback
         while True:
@@ -819,7 +1204,7 @@ def main() -> None:
                         continue
 
                 # Process new messages
-                last_uid = process_uids(uids, last_uid, imap, inky, store)
+                last_uid = process_uids(uids, last_uid, imap, smtp, inky, store)
 
                 # Check if we should consider rebooting due to connection issues
                 try:
@@ -844,6 +1229,16 @@ def main() -> None:
 
     finally:
         imap.logout()
+        # last_uid only ever covers messages already deleted from the mailbox,
+        # so anything still pending here is safe to persist
+        try:
+            store.flush()
+        except Exception:
+            logging.exception("Failed to save UID state on shutdown")
+        _display_executor.shutdown(wait=True)
+        # Let queued replies go out, then close the session on the worker that owns it
+        _reply_executor.submit(smtp.close)
+        _reply_executor.shutdown(wait=True)
 
 
 if __name__ == "__main__":
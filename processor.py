@@ -4,69 +4,115 @@ Extract image attachments from emails, validate image files,
 and store them safely in the data directory.
 """
 # Standard library imports
+import io
 import logging
 import os
 import tempfile
 from email import message_from_bytes
+from email.parser import BytesHeaderParser
 from typing import Optional
 
 # Third-party imports
 import magic
 from PIL import Image
 
+# Local imports
+from storage import fsync_dir
+
 logger = logging.getLogger(__name__)
 
+# libmagic identifies image formats from their leading bytes
+MAGIC_SNIFF_BYTES = 4096
+
+_magic: magic.Magic | None = None
+
+
+def _get_magic() -> magic.Magic:
+    """Return a shared MIME-detecting Magic instance, loading the database once."""
+    global _magic
+    if _magic is None:
+        _magic = magic.Magic(mime=True)
+    return _magic
+
 
 def _is_image_mime(mime: str) -> bool:
     return mime.startswith("image/")
 
 
-def save_attachment_bytes(data: bytes, tmp_dir: str, filename: str) -> str:
-    """Save attachment bytes to a temporary file in tmp_dir.
+def save_attachment_bytes(data: bytes, data_dir: str, filename: str) -> str:
+    """Save attachment bytes under a unique name in data_dir.
     
+    The bytes are written and fsynced under a temporary ".part" name, which
+    image lookups ignore, and only then renamed to the final name, so a power
+    cut never leaves a truncated image in data_dir. The caller fsyncs data_dir
+    once to make the renames durable.
     Returns the path to the saved file.
     """
-    os.makedirs(tmp_dir, exist_ok=True)
-    fd, path = tempfile.mkstemp(prefix="attach-", suffix="-" + filename, dir=tmp_dir)
-    with os.fdopen(fd, "wb") as f:
-        f.write(data)
-        f.flush()
-        os.fsync(f.fileno())
+    fd, tmp_path = tempfile.mkstemp(prefix=".attach-", suffix=".part", dir=data_dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # ".attach-XXXXXXXX.part" -> "attach-XXXXXXXX-<filename>"
+        token = os.path.basename(tmp_path)[len(".attach-"):-len(".part")]
+        path = os.path.join(data_dir, f"attach-{token}-{os.path.basename(filename)}")
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
     return path
 
 
-def validate_and_sanitize_image(path: str) -> bool:
-    """Validate that the file at path is a valid image.
+def validate_image_bytes(data: bytes, filename: str) -> bool:
+    """Validate that the attachment bytes are a valid image.
     
-    Checks MIME type and verifies image integrity using PIL.
+    Checks MIME type and verifies image integrity using PIL, entirely in
+    memory so invalid attachments never touch the disk.
     Returns True if valid, False otherwise.
     """
-    mime = magic.from_file(path, mime=True)
+    mime = _get_magic().from_buffer(data[:MAGIC_SNIFF_BYTES])
     if not _is_image_mime(mime):
-        logger.warning("Attachment %s is not image mime: %s", path, mime)
+        logger.warning("Attachment %s is not image mime: %s", filename, mime)
         return False
 
     try:
-        with Image.open(path) as img:
+        with Image.open(io.BytesIO(data)) as img:
             img.verify()  # verify integrity
     except Exception as exc:
-        logger.exception("Image verification failed for %s: %s", path, exc)
+        logger.exception("Image verification failed for %s: %s", filename, exc)
         return False
     return True
 
 
-def process_message_bytes(msg_bytes: bytes, tmp_dir: str, data_dir: str, max_bytes: int) -> dict:
+def process_message_bytes(msg_bytes: bytes, data_dir: str, max_bytes: int) -> dict:
     """Process email message bytes and extract valid image attachments.
     
     Args:
         msg_bytes: Raw email message bytes
-        tmp_dir: Temporary directory for processing
         data_dir: Final destination directory for valid images
         max_bytes: Maximum allowed attachment size
     
     Returns:
-        Dict with 'ok' (bool), 'reason' (str), 'filename' (str), and 'saved_paths' (list)
+        Dict with 'ok' (bool), 'from_addr' (str), 'reason' (str), 'filename' (str), and 'paths' (list)
     """
+    # Cheap checks on the headers alone before paying for a full MIME parse
+    headers = BytesHeaderParser().parsebytes(msg_bytes)
+    from_addr = headers.get("From")
+    if headers.get_content_maintype() != "multipart":
+        # A single-part message without Content-Disposition has no attachment at all
+        if not headers.get("Content-Disposition"):
+            return {"ok": False, "from_addr": from_addr, "reason": "no_valid_image"}
+        # Its body is the only attachment; base64 inflates it by 4/3, so beyond
+        # twice the per-attachment limit it cannot be acceptable. Multipart
+        # messages may carry several attachments each within the limit; their
+        # parts are size-checked individually below.
+        if len(msg_bytes) > 2 * max_bytes:
+            return {"ok": False, "from_addr": from_addr, "reason": "attachment_too_large"}
+
     msg = message_from_bytes(msg_bytes)
     saved_paths = []
     os.makedirs(data_dir, exist_ok=True)
@@ -78,26 +124,29 @@ def process_message_bytes(msg_bytes: bytes, tmp_dir: str, data_dir: str, max_byt
         if part.get_content_maintype() == 'multipart':
             continue
         filename = part.get_filename() or "attachment"
+        # Reject oversized base64 parts from their encoded length before decoding them
+        if part.get("Content-Transfer-Encoding", "").strip().lower() == "base64":
+            encoded = part.get_payload(decode=False)
+            if isinstance(encoded, str):
+                line_breaks = encoded.count("\n") + encoded.count("\r")
+                if (len(encoded) - line_breaks) * 3 // 4 - 2 > max_bytes:
+                    return {"ok": False, "from_addr": from_addr, "reason": "attachment_too_large", "filename": filename}
         payload = part.get_payload(decode=True)
         if not payload:
             continue
         if len(payload) > max_bytes:
-            return {"ok": False, "reason": "attachment_too_large", "filename": filename}
-
-        tmp_path = save_attachment_bytes(payload, tmp_dir, filename)
-        ok = validate_and_sanitize_image(tmp_path)
-        if not ok:
-            try:
-                os.remove(tmp_path)
-            except Exception as exc:
-                logger.debug("Failed to remove invalid image temp file %s: %s", tmp_path, exc)
+            return {"ok": False, "from_addr": from_addr, "reason": "attachment_too_large", "filename": filename}
+
+        if not validate_image_bytes(payload, filename):
             continue
 
-        final_name = os.path.basename(tmp_path)
-        final_path = os.path.join(data_dir, final_name)
-        os.replace(tmp_path, final_path)
-        saved_paths.append(final_path)
+        saved_paths.append(save_attachment_bytes(payload, data_dir, filename))
 
     if not saved_paths:
-        return {"ok": False, "reason": "no_valid_image"}
-    return {"ok": True, "paths": saved_paths}
+        return {"ok": False, "from_addr": from_addr, "reason": "no_valid_image"}
+    # One flush per message for the new directory entries
+    try:
+        fsync_dir(data_dir)
+    except OSError as exc:
+        logger.debug("Failed to fsync data dir %s: %s", data_dir, exc)
+    return {"ok": True, "from_addr": from_addr, "paths": saved_paths}
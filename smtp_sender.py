@@ -1,14 +1,21 @@
 """Simple SMTP sender for confirmation and error emails.
 
-Provides send_reply function for sending emails with optional
+Provides the SMTPSender class, which keeps one SMTP session open across
+replies, and the send_reply function for one-off emails with optional
 file or in-memory attachments and HTML content.
 """
 # Standard library imports
+import functools
 import logging
 import mimetypes
+import mmap
 import os
 import smtplib
+import ssl
+import time
 from email.message import EmailMessage
+from email.policy import SMTP as SMTP_POLICY
+from email.utils import getaddresses, parseaddr
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
@@ -36,6 +43,16 @@ def get_user_friendly_error(error_code: str) -> str:
     return ERROR_MESSAGES.get(error_code, f"An error occurred: {error_code}")
 
 
+TEMPLATE_DIR = Path(__file__).parent / "templates"
+
+
+@functools.lru_cache(maxsize=None)
+def _load_template(template_name: str) -> str:
+    """Read a template file once; templates ship with the code and do not change at runtime."""
+    with open(TEMPLATE_DIR / template_name, "r", encoding="utf-8") as f:
+        return f.read()
+
+
 def render_template(template_name: str, **kwargs) -> str:
     """Load and render an HTML email template.
     
@@ -46,29 +63,46 @@ def render_template(template_name: str, **kwargs) -> str:
     Returns:
         Rendered HTML string
     """
-    template_dir = Path(__file__).parent / "templates"
-    template_path = template_dir / template_name
-    
     try:
-        with open(template_path, "r", encoding="utf-8") as f:
-            template_content = f.read()
+        template_content = _load_template(template_name)
         return template_content.format(**kwargs)
     except FileNotFoundError:
-        logger.error("Template not found: %s", template_path)
+        logger.error("Template not found: %s", TEMPLATE_DIR / template_name)
         raise
     except KeyError as e:
         logger.error("Missing template variable: %s", e)
         raise
 
 
-def send_reply(smtp_host: str, smtp_port: int, smtp_user: str, smtp_pass: str, to_addr: str, subject: str, body: str, attachments: list[str | tuple] | None = None, html_body: str | None = None) -> None:
-    """Send a reply email with optional file or in-memory attachments and HTML content.
+# Image types the frame handles, independent of the platform's mimetypes database
+IMAGE_ATTACHMENT_TYPES = {
+    ".jpg": ("image", "jpeg"),
+    ".jpeg": ("image", "jpeg"),
+    ".png": ("image", "png"),
+    ".gif": ("image", "gif"),
+    ".bmp": ("image", "bmp"),
+    ".webp": ("image", "webp"),
+    ".heic": ("image", "heic"),
+}
+
+
+@functools.lru_cache(maxsize=128)
+def _attachment_type(ext: str) -> tuple[str, str]:
+    """Return (maintype, subtype) for a lowercased file extension such as '.jpg'."""
+    if ext in IMAGE_ATTACHMENT_TYPES:
+        return IMAGE_ATTACHMENT_TYPES[ext]
+    ctype, _ = mimetypes.guess_type("attachment" + ext)
+    if ctype is None:
+        return "application", "octet-stream"
+    maintype, subtype = ctype.split("/", 1)
+    return maintype, subtype
+
+
+def build_reply_message(from_addr: str, to_addr: str, subject: str, body: str, attachments: list[str | tuple] | None = None, html_body: str | None = None) -> EmailMessage:
+    """Build a reply email with optional file or in-memory attachments and HTML content.
 
     Args:
-        smtp_host: SMTP server hostname
-        smtp_port: SMTP server port
-        smtp_user: SMTP username
-        smtp_pass: SMTP password
+        from_addr: Sender email address
         to_addr: Recipient email address
         subject: Email subject line
         body: Email body text (plain text fallback)
@@ -87,7 +121,7 @@ def send_reply(smtp_host: str, smtp_port: int, smtp_user: str, smtp_pass: str, t
     """
 
     msg = EmailMessage()
-    msg["From"] = smtp_user
+    msg["From"] = from_addr
     msg["To"] = to_addr
     msg["Subject"] = subject
     
@@ -119,21 +153,136 @@ def send_reply(smtp_host: str, smtp_port: int, smtp_user: str, smtp_pass: str, t
                 # Otherwise it's a file path (str)
                 else:
                     path = item
-                    ctype, encoding = mimetypes.guess_type(path)
-                    if ctype is None:
-                        maintype, subtype = "application", "octet-stream"
-                    else:
-                        maintype, subtype = ctype.split("/", 1)
+                    maintype, subtype = _attachment_type(os.path.splitext(path)[1].lower())
 
                     with open(path, "rb") as f:
-                        data = f.read()
-
-                    msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=os.path.basename(path))
+                        if os.fstat(f.fileno()).st_size == 0:
+                            msg.add_attachment(b"", maintype=maintype, subtype=subtype, filename=os.path.basename(path))
+                            continue
+                        # Map the file instead of copying it into a bytes object; the
+                        # MIME part only keeps the base64 text produced from the mapping.
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped, memoryview(mapped) as data:
+                            msg.add_attachment(data, maintype=maintype, subtype=subtype, filename=os.path.basename(path))
             except Exception:
                 logger.exception("Failed to attach %s", item)
 
-    with smtplib.SMTP(smtp_host, smtp_port, timeout=30) as s:
-        s.starttls()
-        s.login(smtp_user, smtp_pass)
-        s.send_message(msg)
-    logger.info("Sent reply to %s", to_addr)
+    return msg
+
+
+# Submission port that speaks TLS immediately (RFC 8314) instead of STARTTLS
+SMTP_IMPLICIT_TLS_PORT = 465
+
+
+@functools.lru_cache(maxsize=None)
+def _tls_context() -> ssl.SSLContext:
+    """Shared TLS context, so the CA store is loaded once rather than per connection."""
+    return ssl.create_default_context()
+
+
+class SMTPSender:
+    """Persistent SMTP session for sending replies.
+
+    Keeps a single TLS-authenticated connection open across messages so the
+    TCP/TLS handshake, EHLO and AUTH are paid once instead of per reply. A session
+    that has been idle for longer than `keepalive_interval` seconds is probed with
+    NOOP before reuse, and a dropped connection is re-established once per send.
+
+    Usable as a context manager, which closes the session on exit.
+
+    Not thread-safe; use it from a single thread.
+    """
+
+    def __init__(self, host: str, port: int, user: str, password: str, timeout: int = 30, keepalive_interval: int = 240):
+        self.host = host
+        self.port = port
+        self.user = user
+        self.password = password
+        self.timeout = timeout
+        self.keepalive_interval = keepalive_interval
+        self.client: smtplib.SMTP | None = None
+        self._last_used = 0.0
+
+    def connect(self) -> None:
+        logger.debug("Connecting to SMTP %s:%s", self.host, self.port)
+        if self.port == SMTP_IMPLICIT_TLS_PORT:
+            # TLS from the first byte: no plaintext EHLO/STARTTLS round trips
+            client = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout, context=_tls_context())
+        else:
+            client = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        try:
+            if not isinstance(client, smtplib.SMTP_SSL):
+                client.starttls(context=_tls_context())
+            client.login(self.user, self.password)
+        except Exception:
+            try:
+                client.close()
+            except Exception as exc:
+                logger.debug("SMTP close after failed login raised: %s", exc)
+            raise
+        self.client = client
+        self._last_used = time.monotonic()
+        logger.info("Connected to SMTP %s:%s", self.host, self.port)
+
+    def __enter__(self) -> "SMTPSender":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self.client is None:
+            return
+        try:
+            self.client.quit()
+        except Exception as exc:
+            logger.debug("SMTP quit exception (may be expected): %s", exc)
+            try:
+                self.client.close()
+            except Exception:
+                pass
+        self.client = None
+
+    def ensure_connected(self) -> None:
+        """Open the session if needed, replacing it if it went stale while idle."""
+        if self.client is not None and time.monotonic() - self._last_used > self.keepalive_interval:
+            try:
+                code, _ = self.client.noop()
+                if code != 250:
+                    raise smtplib.SMTPServerDisconnected(f"NOOP returned {code}")
+            except (smtplib.SMTPException, OSError) as exc:
+                logger.info("Idle SMTP connection is no longer usable (%s); reconnecting", exc)
+                self.close()
+        if self.client is None:
+            self.connect()
+
+    def send_message(self, msg: EmailMessage) -> None:
+        """Send `msg` over the persistent session, reconnecting once if it was dropped."""
+        # Serialize once up front so a retry does not walk the MIME tree again
+        data = msg.as_bytes(policy=SMTP_POLICY)
+        from_addr = parseaddr(msg["From"])[1]
+        to_addrs = [addr for _, addr in getaddresses(msg.get_all("To", []))]
+        self.ensure_connected()
+        try:
+            self.client.sendmail(from_addr, to_addrs, data)
+        except (smtplib.SMTPServerDisconnected, ConnectionError) as exc:
+            logger.info("SMTP connection lost (%s); reconnecting and retrying", exc)
+            self.close()
+            self.connect()
+            self.client.sendmail(from_addr, to_addrs, data)
+        self._last_used = time.monotonic()
+
+    def send(self, to_addr: str, subject: str, body: str, attachments: list[str | tuple] | None = None, html_body: str | None = None) -> None:
+        """Send a reply email; see `build_reply_message` for the arguments."""
+        msg = build_reply_message(self.user, to_addr, subject, body, attachments, html_body)
+        self.send_message(msg)
+        logger.info("Sent reply to %s", to_addr)
+
+
+def send_reply(smtp_host: str, smtp_port: int, smtp_user: str, smtp_pass: str, to_addr: str, subject: str, body: str, attachments: list[str | tuple] | None = None, html_body: str | None = None) -> None:
+    """Send a single reply email over a one-off SMTP connection.
+
+    Prefer a long-lived `SMTPSender` when sending more than one message.
+    See `build_reply_message` for the meaning of the remaining arguments.
+    """
+    with SMTPSender(smtp_host, smtp_port, smtp_user, smtp_pass) as sender:
+        sender.send(to_addr, subject, body, attachments=attachments, html_body=html_body)
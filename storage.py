@@ -5,28 +5,80 @@ processed email UID state using JSON.
 """
 # Standard library imports
 import json
+import logging
 import os
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
+
+def fsync_dir(path: str) -> None:
+    """Flush directory entries (e.g. renames into `path`) to disk."""
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
 
 class UIDStore:
+    """JSON-backed UID state, read from disk once and then kept in memory.
+
+    This process is the only writer, so the cached copy stays authoritative.
+    `set_last_uid` only updates memory; call `flush()` at the end of a batch
+    to persist the latest state durably.
+    """
+
     def __init__(self, path: str):
         self.path = path
         os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._data: Optional[dict] = None
+        self._dirty = False
 
     def load(self) -> dict:
-        if not os.path.exists(self.path):
-            return {}
-        with open(self.path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        if self._data is None:
+            if not os.path.exists(self.path):
+                self._data = {}
+            else:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        self._data = json.load(f)
+                except ValueError as exc:
+                    # An interrupted write on the FAT stick can leave the file
+                    # empty or truncated; start over rather than fail to boot
+                    logger.warning("Ignoring unreadable UID state %s: %s", self.path, exc)
+                    self._data = {}
+        return self._data
+
+    def save(self, data: dict, fsync: bool = True) -> None:
+        """Atomically replace the state file with `data`.
 
-    def save(self, data: dict) -> None:
+        With `fsync=False` the write is not forced to disk and the state stays
+        marked dirty, so the next `flush()` writes it durably.
+        """
         tmp = self.path + ".tmp"
-        with open(tmp, "w", encoding="utf-8") as f:
-            json.dump(data, f)
-            f.flush()
-            os.fsync(f.fileno())
+        # Serialize first, then hand the whole buffer to the kernel in one write
+        buf = json.dumps(data).encode("utf-8")
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            view = memoryview(buf)
+            while view:
+                view = view[os.write(fd, view):]
+            if fsync:
+                os.fsync(fd)
+        finally:
+            os.close(fd)
         os.replace(tmp, self.path)
+        if fsync:
+            # Make the rename itself durable, not just the file contents
+            fsync_dir(os.path.dirname(self.path) or ".")
+        self._data = data
+        self._dirty = not fsync
+
+    def flush(self) -> None:
+        """Write pending changes, if any, to disk."""
+        if self._dirty:
+            self.save(self._data)
 
     def get_last_uid(self) -> Optional[int]:
         data = self.load()
@@ -35,4 +87,4 @@ class UIDStore:
     def set_last_uid(self, uid: int) -> None:
         data = self.load()
         data["last_uid"] = uid
-        self.save(data)
+        self._dirty = True